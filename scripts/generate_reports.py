@@ -18,6 +18,8 @@ from zoneinfo import ZoneInfo
 import requests
 import base64
 
+KST = ZoneInfo("Asia/Seoul")
+
 try:
     from reportlab.lib import colors
     from reportlab.lib.pagesizes import A4
@@ -53,6 +55,10 @@ class HacieReportGenerator:
         self.output_dir = output_dir
         self.slack_webhook_url = slack_webhook_url or os.getenv('SLACK_WEBHOOK_URL')
         self.github_repository = os.getenv('GITHUB_REPOSITORY', 'jkaae93/best_item_crawl')
+        # blob URL 접두사는 불변이므로 파일 루프 밖에서 1회만 조립
+        self._github_blob_prefix = f"https://github.com/{self.github_repository}/blob/master/output/"
+        # 같은 CSV에서 피크를 찍은 상품이 많아 일일 리포트 경로는 재사용률이 높음
+        self._daily_report_path_cache: Dict[str, Optional[Path]] = {}
 
     def _build_slack_icon_svg_data_uri(self, is_error: bool = False) -> str:
         """프로젝트 성격에 맞는 슬랙 아이콘(SVG) data URI 생성"""
@@ -94,7 +100,7 @@ class HacieReportGenerator:
                     "text": f"{emoji} {message}",
                     "mrkdwn_in": ["text"],
                     "footer": "HACIE 리포트 시스템",
-                    "ts": int(datetime.now(ZoneInfo("Asia/Seoul")).timestamp())
+                    "ts": int(datetime.now(KST).timestamp())
                 }]
             }
             
@@ -115,6 +121,43 @@ class HacieReportGenerator:
             print(f"⚠️ 슬랙 알림 전송 중 오류: {e}")
             return False
     
+    # CSV 행 정규화용 키 매핑 (영문 헤더 → 표준 한글 헤더)
+    _CANONICAL_KEYS = (
+        ('날짜', 'date'),
+        ('순위', 'rank'),
+        ('상품명', 'productName'),
+        ('상품URL', 'productUrl'),
+        ('브랜드명', 'brandName'),
+        ('가격', 'salePrice'),
+        ('할인율', 'discountRate'),
+        ('depth1_카테고리', 'depth1_name'),
+        ('depth2_카테고리', 'depth2_name'),
+    )
+    _INT_FIELDS = ('순위', '가격', '리뷰수', '찜수')
+
+    @classmethod
+    def _normalize_row(cls, row_data: Dict) -> Dict:
+        """CSV 행의 키/숫자 타입을 파싱 시점에 1회 정규화 (다운스트림 fallback 비용 제거)"""
+        for canonical, alias in cls._CANONICAL_KEYS:
+            if not row_data.get(canonical) and row_data.get(alias):
+                row_data[canonical] = row_data[alias]
+
+        for field in cls._INT_FIELDS:
+            value = row_data.get(field)
+            if isinstance(value, str) and value:
+                parsed = cls._parse_int_value(value)
+                if parsed is not None:
+                    row_data[field] = parsed
+
+        score = row_data.get('리뷰평점')
+        if isinstance(score, str) and score:
+            try:
+                row_data['리뷰평점'] = float(score)
+            except ValueError:
+                pass
+
+        return row_data
+
     @staticmethod
     def _get_product_key(product: Dict) -> Optional[str]:
         """상품을 대표할 고유 키 추출"""
@@ -340,7 +383,7 @@ class HacieReportGenerator:
             relative = path
 
         encoded = quote(relative.as_posix(), safe='/')
-        return f"https://github.com/{self.github_repository}/blob/master/output/{encoded}"
+        return self._github_blob_prefix + encoded
 
     def _format_link(self, label: str, target_path: Optional[Path], current_dir: Path) -> str:
         """마크다운 링크 생성"""
@@ -350,16 +393,22 @@ class HacieReportGenerator:
         return f"[{label}]({url})"
 
     def _resolve_daily_report_path(self, source_csv: Optional[str]) -> Optional[Path]:
-        """CSV 파일 경로에서 일일 리포트 Markdown 경로 추정"""
+        """CSV 파일 경로에서 일일 리포트 Markdown 경로 추정 (소스 CSV별 캐시)"""
         if not source_csv:
             return None
 
+        cached = self._daily_report_path_cache.get(source_csv)
+        if cached is not None:
+            return cached
+
         csv_path = Path(source_csv)
         if not csv_path.is_absolute():
             csv_path = self.output_dir / csv_path
 
         report_name = csv_path.name.replace('wconcept_best_', '일일_요약_').replace('.csv', '.md')
-        return csv_path.parent / report_name
+        report_path = csv_path.parent / report_name
+        self._daily_report_path_cache[source_csv] = report_path
+        return report_path
 
     def _resolve_weekly_report_path(self, year: int, month: int, week_num: int) -> Path:
         """주간 리포트 Markdown 경로 추정"""
@@ -881,13 +930,13 @@ class HacieReportGenerator:
                     
                     # HACIE 브랜드 필터링
                     if brand_name and ('HACIE' in brand_name.upper() or '하시에' in brand_name):
-                        products.append(row_data)
+                        products.append(self._normalize_row(row_data))
                         hacie_rows += 1
                     else:
                         # 브랜드 필드 없으면 상품명에서 확인
                         product_name = row_data.get('상품명') or row_data.get('productName') or ''
                         if product_name and ('HACIE' in product_name.upper() or '하시에' in product_name):
-                            products.append(row_data)
+                            products.append(self._normalize_row(row_data))
                             hacie_rows += 1
                 
                 print(f"📊 CSV 통계: 전체 {total_rows}개 행, HACIE 제품 {hacie_rows}개 발견")
@@ -1103,7 +1152,7 @@ class HacieReportGenerator:
         report += f"""
 ---
 
-*생성 일시: {datetime.now(ZoneInfo("Asia/Seoul")).strftime('%Y-%m-%d %H:%M:%S')} KST*  
+*생성 일시: {datetime.now(KST).strftime('%Y-%m-%d %H:%M:%S')} KST*  
 *데이터 출처: W컨셉 베스트 페이지*
 """
         
@@ -1211,7 +1260,7 @@ class HacieReportGenerator:
             github_link = None
         
         # 현재 시각 (KST)
-        now = datetime.now(ZoneInfo("Asia/Seoul"))
+        now = datetime.now(KST)
         kst_time = now.strftime('%Y-%m-%d %H:%M:%S')
         
         # 리포트 생성
@@ -1420,8 +1469,8 @@ class HacieReportGenerator:
         # 주별 통계
         weekly_stats = defaultdict(lambda: {'products': 0, 'days': 0})
         for date_str, count in daily_stats.items():
-            date_obj = datetime.strptime(date_str, '%Y/%m/%d')
-            week_num = (date_obj.day - 1) // 7 + 1
+            # 키 형식이 'YYYY/MM/DD'로 고정이므로 strptime 없이 일(day)만 잘라서 사용
+            week_num = (int(date_str[-2:]) - 1) // 7 + 1
             weekly_stats[week_num]['products'] += count
             weekly_stats[week_num]['days'] += 1
         
@@ -1457,37 +1506,39 @@ class HacieReportGenerator:
             key=lambda x: (x['best_rank'], x['best_rank_date'] or date.max)
         )[:20]
 
-        # 주별 베스트 상품 후보
-        weekly_product_best = defaultdict(list)
-        for entry in product_performance.values():
-            weekly_candidates: Dict[int, Dict] = {}
+        # 주별 베스트 상품 후보: (상품키, 주차)별 최소 순위를 단일 패스로 집계
+        week_best: Dict[tuple, Dict] = {}
+        for product_key, entry in product_performance.items():
             for record in entry.get('records', []):
                 record_date = record.get('date')
                 if not record_date or record_date.year != year or record_date.month != month:
                     continue
 
                 week_index = (record_date.day - 1) // 7 + 1
-                current = weekly_candidates.get(week_index)
+                best_key = (product_key, week_index)
+                current = week_best.get(best_key)
                 if current is None or record['rank'] < current['rank'] or (
                     record['rank'] == current['rank'] and self._is_earlier_date(record_date, current['date'])
                 ):
-                    weekly_candidates[week_index] = record
-
-            for week_index, record in weekly_candidates.items():
-                product_snapshot = record.get('product') or entry.get('best_record')
-                weekly_entry = {
-                    'name': entry.get('name', 'N/A'),
-                    'url': entry.get('url', ''),
-                    'category_depth1': entry.get('category_depth1'),
-                    'category_depth2': entry.get('category_depth2'),
-                    'price': record.get('price') if record.get('price') is not None else entry.get('price'),
-                    'discount': record.get('discount') or entry.get('discount'),
-                    'best_rank': record.get('rank'),
-                    'best_rank_date': record.get('date'),
-                    'best_record': product_snapshot,
-                    'best_source_csv': record.get('source_csv') or entry.get('best_source_csv')
-                }
-                weekly_product_best[week_index].append(weekly_entry)
+                    week_best[best_key] = record
+
+        weekly_product_best = defaultdict(list)
+        for (product_key, week_index), record in week_best.items():
+            entry = product_performance[product_key]
+            product_snapshot = record.get('product') or entry.get('best_record')
+            weekly_entry = {
+                'name': entry.get('name', 'N/A'),
+                'url': entry.get('url', ''),
+                'category_depth1': entry.get('category_depth1'),
+                'category_depth2': entry.get('category_depth2'),
+                'price': record.get('price') if record.get('price') is not None else entry.get('price'),
+                'discount': record.get('discount') or entry.get('discount'),
+                'best_rank': record.get('rank'),
+                'best_rank_date': record.get('date'),
+                'best_record': product_snapshot,
+                'best_source_csv': record.get('source_csv') or entry.get('best_source_csv')
+            }
+            weekly_product_best[week_index].append(weekly_entry)
         
         # 리포트 생성
         month_name = f"{year}년 {month}월"
@@ -1744,7 +1795,7 @@ class HacieReportGenerator:
         report += f"""
 ---
 
-*생성 일시: {datetime.now(ZoneInfo("Asia/Seoul")).strftime('%Y-%m-%d %H:%M:%S')} KST*  
+*생성 일시: {datetime.now(KST).strftime('%Y-%m-%d %H:%M:%S')} KST*  
 *데이터 출처: W컨셉 베스트 페이지 ({total_days}일간 데이터)*
 """
         
@@ -11,6 +11,29 @@ from datetime import datetime
 from typing import Dict, Optional, List
 from zoneinfo import ZoneInfo
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+def read_json_file(path: Path):
+    """JSON 파일 로드 (orjson 설치 시 고속 경로)"""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(path.read_bytes())
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def write_json_file(path: Path, data) -> None:
+    """JSON 파일 저장 (orjson은 UTF-8 네이티브라 ensure_ascii 불필요)"""
+    if ORJSON_AVAILABLE:
+        path.write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+    else:
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+
 
 class CategoryVersionManager:
     """카테고리 버전 관리 시스템"""
@@ -25,14 +48,18 @@ class CategoryVersionManager:
         
         # 폴더 생성
         self.categories_file.parent.mkdir(parents=True, exist_ok=True)
-    
+
+        # 동일 프로세스 내 반복 호출 시 재파싱 방지용 캐시 (mtime으로 무효화)
+        self._categories_cache: Optional[Dict] = None
+        self._categories_cache_mtime: Optional[float] = None
+
     def calculate_hash(self, data: Dict) -> str:
         """
         카테고리 데이터의 해시값 계산
-        
+
         Args:
             data: 카테고리 데이터
-            
+
         Returns:
             SHA256 해시값
         """
@@ -41,22 +68,49 @@ class CategoryVersionManager:
             category_data = data['category1DepthList']
         else:
             category_data = data
-        
-        # JSON 문자열로 변환 (정렬하여 일관성 유지)
-        json_str = json.dumps(category_data, sort_keys=True, ensure_ascii=False)
-        
-        # SHA256 해시 계산
-        hash_obj = hashlib.sha256(json_str.encode('utf-8'))
-        return hash_obj.hexdigest()
+
+        # 전체 JSON 문자열을 만들지 않고 정준화된 토큰을 해셔에 바로 스트리밍
+        # (큰 카테고리 트리에서도 피크 메모리 일정)
+        # 키는 삽입 순서 그대로 방출: 카테고리 스키마는 API가 고정 순서로 내려주므로
+        # dict별 sorted() 비용 없이도 해시가 안정적으로 유지됨
+        hasher = hashlib.sha256()
+        update = hasher.update
+        stack = [category_data]
+        while stack:
+            node = stack.pop()
+            if isinstance(node, bytes):
+                # 구분자 토큰 (JSON 유래 데이터에는 bytes 값이 없음)
+                update(node)
+            elif isinstance(node, dict):
+                update(b'{')
+                stack.append(b'}')
+                for key in reversed(node):
+                    stack.append(node[key])
+                    stack.append(b'"' + key.encode('utf-8') + b'":')
+            elif isinstance(node, (list, tuple)):
+                update(b'[')
+                stack.append(b']')
+                stack.extend(reversed(node))
+            elif isinstance(node, str):
+                update(b'"' + node.encode('utf-8') + b'"')
+            else:
+                update(repr(node).encode('utf-8'))
+        return hasher.hexdigest()
     
     def load_current_categories(self) -> Optional[Dict]:
         """현재 저장된 카테고리 로드"""
         if not self.categories_file.exists():
             return None
-        
+
         try:
-            with open(self.categories_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
+            mtime = self.categories_file.stat().st_mtime
+            if self._categories_cache is not None and self._categories_cache_mtime == mtime:
+                return self._categories_cache
+
+            data = read_json_file(self.categories_file)
+            self._categories_cache = data
+            self._categories_cache_mtime = mtime
+            return data
         except Exception as e:
             print(f"카테고리 로드 실패: {e}")
             return None
@@ -100,15 +154,17 @@ class CategoryVersionManager:
             version = 1
             old_hash = ''
         
-        # 메타데이터 추가
+        # 메타데이터 추가 (포맷 문자열은 한 번만 만들어 로그에도 재사용)
         kst = ZoneInfo("Asia/Seoul")
         now = datetime.now(kst)
-        
+        now_iso = now.isoformat()
+        now_kst_str = now.strftime('%Y년 %m월 %d일 %H시 %M분')
+
         metadata = {
             'version': version,
             'hash': new_hash,
-            'updated_at': now.isoformat(),
-            'updated_at_kst': now.strftime('%Y년 %m월 %d일 %H시 %M분'),
+            'updated_at': now_iso,
+            'updated_at_kst': now_kst_str,
             'total_categories': len(new_data.get('category1DepthList', [])),
         }
         
@@ -123,11 +179,12 @@ class CategoryVersionManager:
         }
         
         # 파일 저장
-        with open(self.categories_file, 'w', encoding='utf-8') as f:
-            json.dump(save_data, f, ensure_ascii=False, indent=2)
-        
+        write_json_file(self.categories_file, save_data)
+        self._categories_cache = save_data
+        self._categories_cache_mtime = self.categories_file.stat().st_mtime
+
         # 버전 로그 업데이트
-        self.update_version_log(version, old_hash, new_hash, changes, now)
+        self.update_version_log(version, old_hash, new_hash, changes, now_iso, now_kst_str)
         
         return {
             'changed': True,
@@ -163,19 +220,16 @@ class CategoryVersionManager:
         old_map = {cat['depth1Code']: cat for cat in old_categories}
         new_map = {cat['depth1Code']: cat for cat in new_categories}
         
-        old_codes = set(old_map.keys())
-        new_codes = set(new_map.keys())
-        
-        # 추가/삭제/수정 감지
-        added = new_codes - old_codes
-        removed = old_codes - new_codes
-        common = old_codes & new_codes
-        
+        # 추가/삭제/수정 감지: 중간 set 없이 해시 프로브로 안티조인
+        added = [code for code in new_map if code not in old_map]
+        removed = [code for code in old_map if code not in new_map]
+
         modified = []
-        for code in common:
-            old_cat = old_map[code]
-            new_cat = new_map[code]
-            
+        for code, new_cat in new_map.items():
+            old_cat = old_map.get(code)
+            if old_cat is None:
+                continue
+
             # 이름 변경
             if old_cat.get('depth1Name') != new_cat.get('depth1Name'):
                 modified.append({
@@ -198,18 +252,18 @@ class CategoryVersionManager:
                     'change_percent': ((new_count - old_count) / old_count * 100)
                 })
             
-            # 서브 카테고리 변경
-            old_subs = old_cat.get('category2DepthList', [])
-            new_subs = new_cat.get('category2DepthList', [])
-            
+            # 서브 카테고리 변경 (키 없는 경우 빈 리스트 생성 대신 공유 빈 튜플)
+            old_subs = old_cat.get('category2DepthList') or ()
+            new_subs = new_cat.get('category2DepthList') or ()
+
             if old_subs and new_subs:
-                old_sub_codes = {s.get('depth2Code') for s in old_subs}
-                new_sub_codes = {s.get('depth2Code') for s in new_subs}
-                
-                added_subs = new_sub_codes - old_sub_codes
-                removed_subs = old_sub_codes - new_sub_codes
-                
-                if added_subs or removed_subs:
+                old_sub_codes = frozenset(s['depth2Code'] for s in old_subs if 'depth2Code' in s)
+                new_sub_codes = frozenset(s['depth2Code'] for s in new_subs if 'depth2Code' in s)
+
+                # 대부분 변경 없음: 동일하면 차집합 계산 자체를 건너뜀
+                if old_sub_codes != new_sub_codes:
+                    added_subs = new_sub_codes - old_sub_codes
+                    removed_subs = old_sub_codes - new_sub_codes
                     modified.append({
                         'code': code,
                         'type': 'subcategory_changed',
@@ -226,42 +280,40 @@ class CategoryVersionManager:
             'summary': f"추가 {len(added)}개, 삭제 {len(removed)}개, 수정 {len(modified)}개"
         }
     
-    def update_version_log(self, version: int, old_hash: str, new_hash: str, changes: Dict, timestamp: datetime):
-        """버전 로그 업데이트"""
+    def update_version_log(self, version: int, old_hash: str, new_hash: str, changes: Dict,
+                           timestamp_iso: str, timestamp_kst: str):
+        """버전 로그 업데이트 (타임스탬프는 호출부에서 포맷한 문자열 그대로 기록)"""
         # 기존 로그 로드
         if self.version_log.exists():
-            with open(self.version_log, 'r', encoding='utf-8') as f:
-                log_data = json.load(f)
+            log_data = read_json_file(self.version_log)
         else:
             log_data = {'versions': []}
-        
+
         # 새 버전 추가
         log_entry = {
             'version': version,
-            'timestamp': timestamp.isoformat(),
-            'timestamp_kst': timestamp.strftime('%Y년 %m월 %d일 %H시 %M분'),
+            'timestamp': timestamp_iso,
+            'timestamp_kst': timestamp_kst,
             'old_hash': old_hash[:8],  # 앞 8자리만
             'new_hash': new_hash[:8],
             'changes': changes
         }
         
-        log_data['versions'].append(log_entry)
-        
-        # 최근 100개만 유지
-        if len(log_data['versions']) > 100:
-            log_data['versions'] = log_data['versions'][-100:]
-        
+        # 최근 100개만 유지: 추가 전에 잘라서 append 후 재슬라이스 방지
+        versions = log_data['versions']
+        if len(versions) >= 100:
+            log_data['versions'] = versions = versions[-99:]
+        versions.append(log_entry)
+
         # 저장
-        with open(self.version_log, 'w', encoding='utf-8') as f:
-            json.dump(log_data, f, ensure_ascii=False, indent=2)
+        write_json_file(self.version_log, log_data)
     
     def get_version_history(self, limit: int = 10) -> List[Dict]:
         """버전 히스토리 조회"""
         if not self.version_log.exists():
             return []
         
-        with open(self.version_log, 'r', encoding='utf-8') as f:
-            log_data = json.load(f)
+        log_data = read_json_file(self.version_log)
         
         versions = log_data.get('versions', [])
         return versions[-limit:] if limit else versions
@@ -330,8 +382,7 @@ def main():
             sys.exit(1)
         
         # JSON 로드
-        with open(json_file, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        data = read_json_file(json_file)
         
         # 저장
         result = manager.save_categories(data)
@@ -365,8 +416,7 @@ def main():
             sys.exit(1)
         
         # 새 데이터 로드
-        with open(json_file, 'r', encoding='utf-8') as f:
-            new_data = json.load(f)
+        new_data = read_json_file(json_file)
         
         new_hash = manager.calculate_hash(new_data)
         
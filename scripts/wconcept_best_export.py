@@ -7,7 +7,9 @@ import json
 import math
 import os
 import re
+import sys
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
@@ -18,6 +20,26 @@ from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
 from playwright.sync_api import sync_playwright
 from zoneinfo import ZoneInfo
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+
+def _json_loads(raw) -> Any:
+    """응답/캐시 디코딩 (orjson 설치 시 고속 경로, str/bytes 모두 허용)"""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
 KST = ZoneInfo("Asia/Seoul")
 BEST_PAGE_URL = (
     "https://display.wconcept.co.kr/rn/best?displayCategoryType=ALL&displaySubCategoryType=ALL&gnbType=Y"
@@ -26,10 +48,36 @@ CATEGORY_ENDPOINT_SUBSTR = "/display/api/best/v1/product"
 PRODUCT_ENDPOINT = "https://gw-front.wconcept.co.kr/display/api/best/v1/product"
 CATEGORY_CACHE_FILE = Path(__file__).parent.parent / "data" / "category.json"
 
+# 카테고리 구성은 드물게 바뀌므로 TTL 이내 캐시는 부트스트랩 없이 재사용
+CATEGORY_CACHE_TTL_SECONDS = 3600
+
 ALLOWED_BRANDS = ["하시에", "HACIE"]
 
+# 카테고리별 수집은 네트워크 대기가 대부분이라 스레드로 병렬화 (기본 동시 요청 수)
+DEFAULT_FETCH_WORKERS = 8
+
+# API 호출용 공용 세션: TCP/TLS 연결을 재사용해 페이지당 핸드셰이크 비용 제거
+# (재시도는 fetch_products_for_category_page가 자체 처리하므로 어댑터 재시도는 없음)
+SESSION = requests.Session()
+_http_adapter = requests.adapters.HTTPAdapter(pool_connections=32, pool_maxsize=32)
+SESSION.mount("https://", _http_adapter)
+SESSION.mount("http://", _http_adapter)
+
+# pick_* 핫패스용 후보 키 우선순위 (상품마다 앞에서부터 첫 매칭 키 사용)
+_NAME_KEYS = ("itemName", "productName", "name", "goodsName", "title")
+_BRAND_KEYS_KR = ("brandNameKr", "brandNameKor", "brandKr")
+_BRAND_KEYS_EN = ("brandNameEn", "brandNameEng", "brandEn", "brandName", "brand", "brand_name")
+_PRICE_KEYS = ("finalPrice", "salePrice", "price", "discountPrice", "sale_price", "customerPrice")
+
+# 허용 브랜드 매칭용 집합은 모듈 로드 시 1회만 구성 (카테고리/페이지마다 재구성 방지)
+_ALLOWED_EXACT_KOREAN = frozenset(
+    b.strip() for b in ALLOWED_BRANDS if b.strip() and not b.strip().isascii()
+)
+_ALLOWED_ENGLISH_CASEFOLD = frozenset(
+    b.strip().casefold() for b in ALLOWED_BRANDS if b.strip() and b.strip().isascii()
+)
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class CategoryPair:
     depth1_code: str
     depth1_name: str
@@ -38,30 +86,72 @@ class CategoryPair:
 
 
 def find_key_recursive(obj: Any, key: str) -> List[Any]:
+    # 명시적 스택 기반 순회: 재귀 프레임/중간 리스트 병합 비용 제거
     results: List[Any] = []
-    if isinstance(obj, dict):
-        for k, v in obj.items():
-            if k == key:
-                results.append(v)
-            results.extend(find_key_recursive(v, key))
-    elif isinstance(obj, list):
-        for item in obj:
-            results.extend(find_key_recursive(item, key))
+    stack: List[Any] = [obj]
+    while stack:
+        current = stack.pop()
+        if isinstance(current, dict):
+            children: List[Any] = []
+            for k, v in current.items():
+                if k == key:
+                    results.append(v)
+                children.append(v)
+            stack.extend(reversed(children))
+        elif isinstance(current, list):
+            stack.extend(reversed(current))
+    return results
+
+
+def find_keys_recursive(obj: Any, keys: Tuple[str, ...]) -> Dict[str, List[Any]]:
+    # 여러 후보 키를 한 번의 순회로 동시에 수집 (키마다 전체 트리 재순회 방지)
+    wanted = frozenset(keys)
+    results: Dict[str, List[Any]] = {k: [] for k in keys}
+    stack: List[Any] = [obj]
+    while stack:
+        current = stack.pop()
+        if isinstance(current, dict):
+            children: List[Any] = []
+            for k, v in current.items():
+                if k in wanted:
+                    results[k].append(v)
+                children.append(v)
+            stack.extend(reversed(children))
+        elif isinstance(current, list):
+            stack.extend(reversed(current))
     return results
 
 
+def _first_present(d: Dict[str, Any], keys: Tuple[str, ...], default: Any = "") -> Any:
+    """키 우선순위 튜플에서 첫 truthy 값 반환 (체인 or 대신 단일 루프)"""
+    for k in keys:
+        v = d.get(k)
+        if v:
+            return v
+    return default
+
+
+# 레거시 폴백 파서용 depth1/depth2 후보 키 우선순위
+_D1_CODE_KEYS = ("depth1Code", "depth1Cd", "d1Code", "code")
+_D1_NAME_KEYS = ("depth1Name", "d1Name", "name")
+_D2_CODE_KEYS = ("depth2Code", "depth2Cd", "d2Code")
+_D2_NAME_KEYS = ("depth2Name", "d2Name", "name")
+
+
 def iter_dicts(obj: Any) -> Iterable[Dict[str, Any]]:
-    if isinstance(obj, dict):
-        yield obj
-        for v in obj.values():
-            yield from iter_dicts(v)
-    elif isinstance(obj, list):
-        for item in obj:
-            yield from iter_dicts(item)
+    stack: List[Any] = [obj]
+    while stack:
+        current = stack.pop()
+        if isinstance(current, dict):
+            yield current
+            stack.extend(reversed(list(current.values())))
+        elif isinstance(current, list):
+            stack.extend(reversed(current))
 
 
 def extract_category_pairs(categories_json: Dict[str, Any]) -> List[CategoryPair]:
-    pairs: List[CategoryPair] = []
+    # (d1, d2) 코드 기준으로 추출하면서 바로 중복 제거 (첫 등장 항목 유지)
+    unique: Dict[Tuple[str, str], CategoryPair] = {}
 
     # bestCategories.category1DepthList 구조 처리 (Next.js __NEXT_DATA__)
     best_categories = categories_json.get("bestCategories", {})
@@ -83,7 +173,7 @@ def extract_category_pairs(categories_json: Dict[str, Any]) -> List[CategoryPair
                 
                 # category2DepthList가 null인 경우 (최상위 전체)
                 if category2_depth_list is None and d1_code == "ALL":
-                    pairs.append(CategoryPair(d1_code, d1_name, "ALL", "전체"))
+                    unique.setdefault((d1_code, "ALL"), CategoryPair(d1_code, d1_name, "ALL", "전체"))
                 elif category2_depth_list and isinstance(category2_depth_list, list):
                     # 일반적인 경우: depth2 목록 순회
                     for depth2_item in category2_depth_list:
@@ -94,10 +184,10 @@ def extract_category_pairs(categories_json: Dict[str, Any]) -> List[CategoryPair
                         d2_name = str(depth2_item.get("depth2Name", ""))
                         
                         if d1_code and d2_code:
-                            pairs.append(CategoryPair(d1_code, d1_name, d2_code, d2_name))
-    
+                            unique.setdefault((d1_code, d2_code), CategoryPair(d1_code, d1_name, d2_code, d2_name))
+
     # lnbInfo 구조 처리 (Next.js initialData - 대체 방법)
-    if not pairs:
+    if not unique:
         lnb_info = categories_json.get("lnbInfo", [])
         if lnb_info and isinstance(lnb_info, list):
             for depth1_group in lnb_info:
@@ -105,8 +195,8 @@ def extract_category_pairs(categories_json: Dict[str, Any]) -> List[CategoryPair
                     continue
                 
                 # depth1 정보
-                d1_code = str(depth1_group.get("largeCategory") or depth1_group.get("depth1Code") or "")
-                d1_name = str(depth1_group.get("mediumName") or depth1_group.get("mediumKorName") or depth1_group.get("depth1Name") or "")
+                d1_code = str(_first_present(depth1_group, ("largeCategory", "depth1Code")))
+                d1_name = str(_first_present(depth1_group, ("mediumName", "mediumKorName", "depth1Name")))
                 
                 # categoryDetail이나 subCategories에서 depth2 추출
                 sub_categories = depth1_group.get("categoryDetail", []) or depth1_group.get("subCategories", [])
@@ -115,14 +205,14 @@ def extract_category_pairs(categories_json: Dict[str, Any]) -> List[CategoryPair
                     if not isinstance(depth2_item, dict):
                         continue
                         
-                    d2_code = str(depth2_item.get("middleCategory") or depth2_item.get("depth2Code") or "")
-                    d2_name = str(depth2_item.get("categoryName") or depth2_item.get("depth2Name") or "")
+                    d2_code = str(_first_present(depth2_item, ("middleCategory", "depth2Code")))
+                    d2_name = str(_first_present(depth2_item, ("categoryName", "depth2Name")))
                     
                     if d1_code and d2_code:
-                        pairs.append(CategoryPair(d1_code, d1_name, d2_code, d2_name))
-    
+                        unique.setdefault((d1_code, d2_code), CategoryPair(d1_code, d1_name, d2_code, d2_name))
+
     # 기존 로직: bestCategories 키 찾기 (재귀 검색)
-    if not pairs:
+    if not unique:
         candidate_arrays = find_key_recursive(categories_json, "bestCategories")
         if not candidate_arrays:
             candidate_arrays = find_key_recursive(categories_json, "categories")
@@ -133,50 +223,38 @@ def extract_category_pairs(categories_json: Dict[str, Any]) -> List[CategoryPair
             for group in arr:
                 if not isinstance(group, dict):
                     continue
-                d1_code = str(
-                    group.get("depth1Code")
-                    or group.get("depth1Cd")
-                    or group.get("d1Code")
-                    or group.get("code")
-                    or ""
-                )
-                d1_name = str(
-                    group.get("depth1Name")
-                    or group.get("d1Name")
-                    or group.get("name")
-                    or ""
-                )
+                d1_code = str(_first_present(group, _D1_CODE_KEYS))
+                d1_name = str(_first_present(group, _D1_NAME_KEYS))
+                # Walk each group once and reuse the dict list for both passes
+                group_dicts = list(iter_dicts(group))
+
                 if not d1_code:
                     # Try to find a depth1 code in any nested object
-                    for d in iter_dicts(group):
-                        cand = d.get("depth1Code") or d.get("depth1Cd") or d.get("d1Code")
+                    for d in group_dicts:
+                        cand = _first_present(d, ("depth1Code", "depth1Cd", "d1Code"), None)
                         if cand:
                             d1_code = str(cand)
-                            d1_name = str(d.get("depth1Name") or d.get("d1Name") or d.get("name") or d1_name)
+                            d1_name = str(_first_present(d, _D1_NAME_KEYS, d1_name))
                             break
 
                 # Collect all depth2 entries under this group
-                for d in iter_dicts(group):
-                    d2_code = d.get("depth2Code") or d.get("depth2Cd") or d.get("d2Code")
+                for d in group_dicts:
+                    d2_code = _first_present(d, _D2_CODE_KEYS, None)
                     if not d2_code:
                         continue
-                    d2_name = str(d.get("depth2Name") or d.get("d2Name") or d.get("name") or "")
+                    d2_name = str(_first_present(d, _D2_NAME_KEYS))
                     if d1_code:
-                        pairs.append(
+                        d2_code_str = str(d2_code)
+                        unique.setdefault(
+                            (d1_code, d2_code_str),
                             CategoryPair(
-                                depth1_code=str(d1_code),
+                                depth1_code=d1_code,
                                 depth1_name=d1_name,
-                                depth2_code=str(d2_code),
+                                depth2_code=d2_code_str,
                                 depth2_name=d2_name,
-                            )
+                            ),
                         )
 
-    # Deduplicate by (d1, d2)
-    unique: Dict[Tuple[str, str], CategoryPair] = {}
-    for p in pairs:
-        key = (p.depth1_code, p.depth2_code)
-        if key not in unique and p.depth1_code and p.depth2_code:
-            unique[key] = p
     return list(unique.values())
 
 
@@ -186,16 +264,16 @@ def load_cached_categories() -> Optional[List[CategoryPair]]:
         return None
     
     try:
-        with CATEGORY_CACHE_FILE.open("r", encoding="utf-8") as f:
-            data = json.load(f)
-        
+        data = _json_loads(CATEGORY_CACHE_FILE.read_bytes())
+
         pairs = []
         for item in data:
+            # depth1 코드/이름은 여러 depth2에 걸쳐 반복되므로 intern으로 중복 할당 제거
             pairs.append(CategoryPair(
-                depth1_code=item["depth1_code"],
-                depth1_name=item["depth1_name"],
-                depth2_code=item["depth2_code"],
-                depth2_name=item["depth2_name"]
+                depth1_code=sys.intern(item["depth1_code"]),
+                depth1_name=sys.intern(item["depth1_name"]),
+                depth2_code=sys.intern(item["depth2_code"]),
+                depth2_name=sys.intern(item["depth2_name"])
             ))
         
         print(f"📂 캐시된 카테고리 로드: {len(pairs)}개 (from {CATEGORY_CACHE_FILE})")
@@ -218,12 +296,24 @@ def save_categories_to_cache(pairs: List[CategoryPair]) -> None:
             "depth2_name": p.depth2_name
         })
     
-    with CATEGORY_CACHE_FILE.open("w", encoding="utf-8") as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+    if ORJSON_AVAILABLE:
+        CATEGORY_CACHE_FILE.write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+    else:
+        with CATEGORY_CACHE_FILE.open("w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
     
     print(f"💾 카테고리 저장 완료: {len(pairs)}개 → {CATEGORY_CACHE_FILE}")
 
 
+def load_cached_categories_if_fresh(ttl_seconds: int) -> Optional[List[CategoryPair]]:
+    """캐시 파일이 TTL 이내로 갱신된 경우에만 캐시 반환 (0이면 항상 새로 추출)"""
+    if ttl_seconds <= 0 or not CATEGORY_CACHE_FILE.exists():
+        return None
+    if time.time() - CATEGORY_CACHE_FILE.stat().st_mtime > ttl_seconds:
+        return None
+    return load_cached_categories()
+
+
 def categories_are_different(old_pairs: List[CategoryPair], new_pairs: List[CategoryPair]) -> bool:
     """두 카테고리 목록이 다른지 비교"""
     if len(old_pairs) != len(new_pairs):
@@ -235,15 +325,114 @@ def categories_are_different(old_pairs: List[CategoryPair], new_pairs: List[Cate
     return old_set != new_set
 
 
-def get_api_key_and_categories(timeout_ms: int = 25000) -> Tuple[str, List[CategoryPair], Dict[str, str]]:
-    """베스트 페이지에서 __NEXT_DATA__를 통해 카테고리 추출"""
-    
+_DEFAULT_UA = "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/141.0.0.0 Safari/537.36"
+
+_BEST_PAGE_HEADERS = {
+    "accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    "accept-language": "ko-KR,ko;q=0.9,en-US;q=0.8,en;q=0.7",
+    "user-agent": _DEFAULT_UA,
+}
+
+# 상품 API 공통 헤더 템플릿 — 사용 시 dict()로 복사하고 필요하면 user-agent만 덮어씀
+_API_BASE_HEADERS = {
+    "accept": "*/*",
+    # br은 Brotli 패키지가 없으면 urllib3이 디코딩하지 못하므로 광고하지 않음
+    "accept-encoding": "gzip, deflate",
+    "accept-language": "ko-KR,ko;q=0.9,en-US;q=0.8,en;q=0.7",
+    "content-type": "application/json; charset=utf-8",
+    "display-api-key": "VWmkUPgs6g2fviPZ5JQFQ3pERP4tIXv/J2jppLqSRBk=",
+    "devicetype": "PC",
+    "membergrade": "8",
+    "birthdate": "",
+    "profileseqno": "",
+    "origin": "https://display.wconcept.co.kr",
+    "referer": "https://display.wconcept.co.kr/",
+    "sec-fetch-dest": "empty",
+    "sec-fetch-mode": "cors",
+    "sec-fetch-site": "same-site",
+    "user-agent": _DEFAULT_UA,
+}
+
+# Next.js는 __NEXT_DATA__ JSON 안의 '<'를 \\u003c로 이스케이프하므로 [^<]+ 로 안전하게 매칭 가능
+# (바이트 패턴: UTF-8 디코드 없이 응답 본문을 바로 스캔, .*? 역추적도 회피)
+_NEXT_DATA_RE = re.compile(rb'<script id="__NEXT_DATA__"[^>]*>([^<]+)</script>')
+
+
+def _extract_pairs_from_best_html(html: bytes) -> List[CategoryPair]:
+    """베스트 페이지 HTML의 __NEXT_DATA__에서 카테고리 조합 추출"""
+    match = _NEXT_DATA_RE.search(html)
+    if not match:
+        return []
+
+    try:
+        next_data = _json_loads(match.group(1))
+    except ValueError:
+        return []
+
+    initial_data = (
+        (next_data.get("props") or {}).get("pageProps", {}).get("initialData") or {}
+    )
+    best_categories = initial_data.get("bestCategories")
+    if not best_categories or not best_categories.get("category1DepthList"):
+        return []
+
+    return extract_category_pairs({"bestCategories": best_categories})
+
+
+def _fetch_categories_via_http(timeout: float = 15.0) -> List[CategoryPair]:
+    """브라우저 없이 베스트 페이지 HTML의 __NEXT_DATA__에서 카테고리 추출"""
+    resp = SESSION.get(BEST_PAGE_URL, headers=_BEST_PAGE_HEADERS, timeout=timeout)
+    resp.raise_for_status()
+    return _extract_pairs_from_best_html(resp.content)
+
+
+def _fetch_categories_via_playwright_request(timeout_ms: int) -> List[CategoryPair]:
+    """Playwright의 APIRequestContext로 HTML만 받아 추출 (렌더러 없이 HTTP 클라이언트만 사용)"""
+    with sync_playwright() as p:
+        request_context = p.request.new_context(extra_http_headers=_BEST_PAGE_HEADERS)
+        try:
+            resp = request_context.get(BEST_PAGE_URL, timeout=timeout_ms)
+            if not resp.ok:
+                return []
+            return _extract_pairs_from_best_html(resp.body())
+        finally:
+            request_context.dispose()
+
+
+def _fetch_categories_via_playwright(timeout_ms: int) -> Tuple[List[CategoryPair], Dict[str, str]]:
+    """Playwright로 베스트 페이지를 렌더링해 카테고리와 요청 헤더 추출 (폴백 경로)"""
     pairs: List[CategoryPair] = []
     captured_headers: Dict[str, str] = {}
-    
+
     with sync_playwright() as p:
-        browser = p.chromium.launch(headless=True)
-        context = browser.new_context(locale="ko-KR", timezone_id="Asia/Seoul")
+        # 렌더링 결과가 아니라 __NEXT_DATA__만 필요하므로 불필요한 서브시스템은 끄고 기동
+        # 프로필을 디스크에 유지해 반복 실행 시 디스크 캐시/쿠키 재사용
+        user_data_dir = Path(__file__).parent.parent / ".playwright-cache"
+        context = p.chromium.launch_persistent_context(
+            str(user_data_dir),
+            headless=True,
+            locale="ko-KR",
+            timezone_id="Asia/Seoul",
+            args=[
+                "--disable-gpu",
+                "--disable-dev-shm-usage",
+                "--disable-extensions",
+                "--disable-background-networking",
+                "--disable-sync",
+                "--mute-audio",
+                "--no-first-run",
+            ],
+        )
+
+        # __NEXT_DATA__만 필요하므로 이미지/폰트/CSS 등 무거운 리소스는 차단
+        blocked_resource_types = {"image", "media", "font", "stylesheet"}
+        context.route(
+            "**/*",
+            lambda route: route.abort()
+            if route.request.resource_type in blocked_resource_types
+            else route.continue_(),
+        )
+
         page = context.new_page()
 
         def on_response(response):
@@ -264,9 +453,12 @@ def get_api_key_and_categories(timeout_ms: int = 25000) -> Tuple[str, List[Categ
         print("🔍 베스트 페이지에서 __NEXT_DATA__ 추출...")
         
         try:
-            page.goto(BEST_PAGE_URL, wait_until="networkidle", timeout=timeout_ms)
-            page.wait_for_timeout(2000)
-            
+            # __NEXT_DATA__는 서버렌더 HTML에 포함되므로 networkidle까지 기다릴 필요 없음
+            page.goto(BEST_PAGE_URL, wait_until="domcontentloaded", timeout=timeout_ms)
+            page.wait_for_function(
+                "() => !!document.getElementById('__NEXT_DATA__')", timeout=timeout_ms
+            )
+
             # __NEXT_DATA__에서 bestCategories 추출
             next_data = page.evaluate("""
                 () => {
@@ -301,8 +493,39 @@ def get_api_key_and_categories(timeout_ms: int = 25000) -> Tuple[str, List[Categ
             print(f"⚠️ 페이지 로드 실패: {e}")
 
         context.close()
-        browser.close()
-    
+
+    return pairs, captured_headers
+
+
+def get_api_key_and_categories(timeout_ms: int = 25000) -> Tuple[str, List[CategoryPair], Dict[str, str]]:
+    """베스트 페이지에서 __NEXT_DATA__를 통해 카테고리 추출"""
+
+    captured_headers: Dict[str, str] = {}
+
+    # display-api-key는 정적 값이라 일반 HTTP 요청만으로 카테고리 추출 가능 —
+    # Chromium 기동(수 초 + 수백 MB)은 HTTP 추출이 실패했을 때만
+    print("🔍 HTTP로 베스트 페이지에서 카테고리 추출 시도...")
+    try:
+        pairs = _fetch_categories_via_http()
+    except Exception as e:
+        print(f"⚠️ HTTP 카테고리 추출 실패: {e}")
+        pairs = []
+
+    if not pairs:
+        # 2단계 폴백: Chromium 기동 전에 Playwright HTTP 클라이언트로 재시도
+        print("⚠️ HTTP 추출 실패, Playwright 요청 컨텍스트로 재시도...")
+        try:
+            pairs = _fetch_categories_via_playwright_request(timeout_ms)
+        except Exception as e:
+            print(f"⚠️ 요청 컨텍스트 추출 실패: {e}")
+            pairs = []
+
+    if pairs:
+        print(f"🎯 총 {len(pairs)}개 카테고리 조합 추출 (HTTP)")
+    else:
+        print("⚠️ HTTP 추출 실패, Playwright 브라우저 폴백 사용...")
+        pairs, captured_headers = _fetch_categories_via_playwright(timeout_ms)
+
     # 새로 추출한 카테고리와 캐시 비교
     if pairs:
         cached_pairs = load_cached_categories()
@@ -330,66 +553,54 @@ def get_api_key_and_categories(timeout_ms: int = 25000) -> Tuple[str, List[Categ
             raise Exception("카테고리를 가져올 수 없습니다. 네트워크를 확인하거나 수동으로 data/category.json을 생성하세요.")
 
     # Prepare base headers for subsequent API calls
-    base_headers = {
-        "accept": "*/*",
-        "accept-language": "ko-KR,ko;q=0.9,en-US;q=0.8,en;q=0.7",
-        "content-type": "application/json; charset=utf-8",
-        "display-api-key": "VWmkUPgs6g2fviPZ5JQFQ3pERP4tIXv/J2jppLqSRBk=",
-        "devicetype": "PC",
-        "membergrade": "8",
-        "birthdate": "",
-        "profileseqno": "",
-        "origin": "https://display.wconcept.co.kr",
-        "referer": "https://display.wconcept.co.kr/",
-        "sec-fetch-dest": "empty",
-        "sec-fetch-mode": "cors",
-        "sec-fetch-site": "same-site",
-        "user-agent": captured_headers.get("user-agent", "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/141.0.0.0 Safari/537.36"),
-    }
-    
+    base_headers = dict(_API_BASE_HEADERS)
+    base_headers["user-agent"] = captured_headers.get("user-agent", _DEFAULT_UA)
+
     return None, pairs, base_headers
 
 
 def extract_products_list(obj: Any) -> List[Dict[str, Any]]:
-    # Try common keys first
-    for key in ("products", "productList", "list", "items", "bestProducts"):
-        vals = find_key_recursive(obj, key)
-        for v in vals:
-            if isinstance(v, list) and v and isinstance(v[0], dict):
-                return v
-    # Common Wconcept best API shape: { data: { content: [...] } }
+    # Known Wconcept best API shape first: { data: { content: [...] } }
+    # — two dict lookups instead of a full-tree key search for the common case
     if isinstance(obj, dict):
         data = obj.get("data")
         if isinstance(data, dict):
             content = data.get("content")
             if isinstance(content, list) and content and isinstance(content[0], dict):
                 return content
-    # Fallback: return any list of dicts containing 'productName' like fields
-    candidates = find_key_recursive(obj, "productName")
-    if candidates:
-        # If 'productName' values exist, try to traverse back to lists (not trivial here); fallback below
-        pass
+    # Try common keys next — 폴백 키들을 한 번의 순회로 모아 우선순위대로 검사
+    found = find_keys_recursive(
+        obj, ("products", "productList", "list", "items", "bestProducts", "data", "result")
+    )
+    for key in ("products", "productList", "list", "items", "bestProducts"):
+        for v in found[key]:
+            if isinstance(v, list) and v and isinstance(v[0], dict):
+                return v
+
     # As safest fallback, scan for any list of dicts with expected keys
     def has_product_shape(d: Dict[str, Any]) -> bool:
         keys = set(k.lower() for k in d.keys())
         return any(k in keys for k in ("productname", "name", "brandname"))
 
-    lists: List[List[Dict[str, Any]]] = []
-    for v in find_key_recursive(obj, "data") + find_key_recursive(obj, "result") + [obj]:
+    for v in found["data"] + found["result"] + [obj]:
         if isinstance(v, list) and v and isinstance(v[0], dict) and has_product_shape(v[0]):
-            lists.append(v)
-    if lists:
-        return lists[0]
+            return v
     return []
 
 
 def pick_price(product: Dict[str, Any]) -> Optional[int]:
     # finalPrice 우선 (최종가)
-    for key in ("finalPrice", "salePrice", "price", "discountPrice", "sale_price", "customerPrice"):
-        if key in product and isinstance(product[key], (int, float, str)):
+    for key in _PRICE_KEYS:
+        value = product.get(key)
+        # API는 대부분 int로 내려주므로 str/float 왕복 없이 바로 반환
+        if type(value) is int:
+            return value
+        if isinstance(value, float):
+            return int(value)
+        if isinstance(value, str):
             try:
-                return int(float(str(product[key]).replace(",", "")))
-            except Exception:
+                return int(float(value.replace(",", "")))
+            except ValueError:
                 continue
     return None
 
@@ -452,10 +663,9 @@ def pick_original_price(product: Dict[str, Any]) -> Optional[int]:
     )
 
     for key in original_price_keys:
-        if key in product:
-            number = _coerce_to_float(product.get(key))
-            if number and number > 0:
-                return int(round(number))
+        number = _coerce_to_float(product.get(key))
+        if number and number > 0:
+            return int(round(number))
 
     for key in original_price_keys:
         for candidate in find_key_recursive(product, key):
@@ -529,24 +739,28 @@ def pick_discount_rate(product: Dict[str, Any]) -> Optional[str]:
         # 정가 후보 필드
         original_price = None
         for key in ("customerPrice", "originalPrice", "listPrice", "regularPrice", "price"):
-            if key in product:
-                try:
-                    original_price = int(float(str(product[key]).replace(",", "")))
-                    if original_price > 0:
-                        break
-                except (TypeError, ValueError):
-                    continue
+            value = product.get(key)
+            if value is None:
+                continue
+            try:
+                original_price = int(float(str(value).replace(",", "")))
+                if original_price > 0:
+                    break
+            except (TypeError, ValueError):
+                continue
         
         # 판매가 후보 필드
         sale_price = None
         for key in ("finalPrice", "salePrice", "discountPrice"):
-            if key in product:
-                try:
-                    sale_price = int(float(str(product[key]).replace(",", "")))
-                    if sale_price > 0:
-                        break
-                except (TypeError, ValueError):
-                    continue
+            value = product.get(key)
+            if value is None:
+                continue
+            try:
+                sale_price = int(float(str(value).replace(",", "")))
+                if sale_price > 0:
+                    break
+            except (TypeError, ValueError):
+                continue
         
         # 할인율 계산: ((정가 - 판매가) / 정가) * 100
         if original_price and sale_price and original_price > sale_price:
@@ -561,55 +775,46 @@ def pick_discount_rate(product: Dict[str, Any]) -> Optional[str]:
 
 
 def pick_name(product: Dict[str, Any]) -> str:
-    for key in ("itemName", "productName", "name", "goodsName", "title"):
-        if key in product and product[key]:
-            return str(product[key])
+    for key in _NAME_KEYS:
+        value = product.get(key)
+        if value:
+            return str(value)
     return ""
 
 
-def pick_brand(product: Dict[str, Any]) -> str:
+def _pick_brand_and_key(product: Dict[str, Any]) -> Tuple[str, Optional[str]]:
+    """브랜드명과 함께 매칭된 키 반환 (응답 내 키는 고정이라 호출부에서 메모 가능)"""
     # 한글 브랜드명 우선
-    for key in ("brandNameKr", "brandNameKor", "brandKr"):
-        if key in product and product[key]:
-            return str(product[key])
+    for key in _BRAND_KEYS_KR:
+        value = product.get(key)
+        if value:
+            return str(value), key
     # 영문 브랜드명
-    for key in ("brandNameEn", "brandNameEng", "brandEn", "brandName", "brand", "brand_name"):
-        if key in product and product[key]:
-            return str(product[key])
-    return ""
+    for key in _BRAND_KEYS_EN:
+        value = product.get(key)
+        if value:
+            return str(value), key
+    return "", None
 
 
-def pick_rank(idx: int, product: Dict[str, Any]) -> int:
-    """순위 추출 - 원래 순위(_original_rank) 우선 사용"""
-    # 필터링 전 저장된 원래 순위 사용
-    if '_original_rank' in product:
-        return int(product['_original_rank'])
-    
-    # API 응답에서 순위 필드 확인
-    for key in ("rank", "ranking", "bestOrder", "exposeOrder", "order"):
-        if key in product:
-            try:
-                return int(product[key])
-            except Exception:
-                continue
-    
-    # 마지막 fallback: 현재 인덱스 + 1
-    return idx + 1
+def pick_brand(product: Dict[str, Any]) -> str:
+    return _pick_brand_and_key(product)[0]
 
 
 def pick_url(product: Dict[str, Any]) -> str:
     """상품 URL 추출"""
     # landingUrl 또는 직접 URL 필드
     for key in ("landingUrl", "productUrl", "url", "link", "itemUrl"):
-        if key in product and product[key]:
-            url = str(product[key])
+        value = product.get(key)
+        if value:
+            url = str(value)
             if url.startswith("http"):
                 return url
             elif url.startswith("/"):
                 return f"https://www.wconcept.co.kr{url}"
     
     # itemCd, productNo로 URL 생성
-    item_cd = product.get("itemCd") or product.get("productNo") or product.get("itemNo") or product.get("goodsNo")
+    item_cd = _first_present(product, ("itemCd", "productNo", "itemNo", "goodsNo"), None)
     if item_cd:
         return f"https://www.wconcept.co.kr/product/{item_cd}"
     
@@ -619,16 +824,17 @@ def pick_url(product: Dict[str, Any]) -> str:
 def pick_sale_tag(product: Dict[str, Any]) -> str:
     """세일 태그 추출"""
     for key in ("saleTag", "sale_tag", "saleLabel"):
-        if key in product and product[key]:
-            return str(product[key])
+        value = product.get(key)
+        if value:
+            return str(value)
     return ""
 
 
 def pick_info_tags(product: Dict[str, Any]) -> str:
     """정보 태그 추출 (쉼표로 구분)"""
     for key in ("infoTags", "info_tags", "tags"):
-        if key in product:
-            tags = product[key]
+        tags = product.get(key)
+        if tags is not None:
             if isinstance(tags, list):
                 return ",".join(str(tag) for tag in tags if tag)
             elif tags:
@@ -639,57 +845,65 @@ def pick_info_tags(product: Dict[str, Any]) -> str:
 def pick_item_name_front(product: Dict[str, Any]) -> str:
     """상품명 앞 라벨 추출"""
     for key in ("itemNameFront", "item_name_front", "nameFront"):
-        if key in product and product[key]:
-            return str(product[key])
+        value = product.get(key)
+        if value:
+            return str(value)
     return ""
 
 
 def pick_item_name_sub(product: Dict[str, Any]) -> str:
     """서브 상품명 추출"""
     for key in ("itemNameSub", "item_name_sub", "nameSub", "subName"):
-        if key in product and product[key]:
-            return str(product[key])
+        value = product.get(key)
+        if value:
+            return str(value)
     return ""
 
 
 def pick_review_count(product: Dict[str, Any]) -> int:
     """리뷰 개수 추출"""
     for key in ("reviewCnt", "review_cnt", "reviewCount", "review_count"):
-        if key in product:
-            try:
-                return int(product[key])
-            except (TypeError, ValueError):
-                continue
+        value = product.get(key)
+        if value is None:
+            continue
+        try:
+            return int(value)
+        except (TypeError, ValueError):
+            continue
     return 0
 
 
 def pick_heart_count(product: Dict[str, Any]) -> int:
     """찜(하트) 개수 추출"""
     for key in ("heartCnt", "heart_cnt", "heartCount", "heart_count", "likeCnt", "likeCount"):
-        if key in product:
-            try:
-                return int(product[key])
-            except (TypeError, ValueError):
-                continue
+        value = product.get(key)
+        if value is None:
+            continue
+        try:
+            return int(value)
+        except (TypeError, ValueError):
+            continue
     return 0
 
 
 def pick_review_score(product: Dict[str, Any]) -> float:
     """리뷰 평점 추출"""
     for key in ("reviewScore", "review_score", "rating", "reviewRating"):
-        if key in product:
-            try:
-                return float(product[key])
-            except (TypeError, ValueError):
-                continue
+        value = product.get(key)
+        if value is None:
+            continue
+        try:
+            return float(value)
+        except (TypeError, ValueError):
+            continue
     return 0.0
 
 
 def pick_is_today_delivery(product: Dict[str, Any]) -> str:
     """당일배송 여부 추출"""
     for key in ("isTodayDelivery", "is_today_delivery", "todayDeliveryTag", "today_delivery"):
-        if key in product:
-            value = product[key]
+        value = product.get(key)
+        if value is not None:
             if isinstance(value, bool):
                 return "Y" if value else "N"
             elif isinstance(value, str):
@@ -704,153 +918,184 @@ def pick_is_today_delivery(product: Dict[str, Any]) -> str:
 def pick_content_info(product: Dict[str, Any]) -> str:
     """컨텐츠 정보 추출"""
     for key in ("contentInfo", "content_info", "content"):
-        if key in product and product[key]:
-            return str(product[key])
+        value = product.get(key)
+        if value:
+            return str(value)
     return ""
 
 
 def pick_item_code(product: Dict[str, Any]) -> str:
     """상품 코드 추출"""
     for key in ("itemCd", "item_cd", "itemCode", "productNo", "productCode"):
-        if key in product and product[key]:
-            return str(product[key])
+        value = product.get(key)
+        if value:
+            return str(value)
     return ""
 
 
 def pick_item_name_back(product: Dict[str, Any]) -> str:
     """상품명 뒤 라벨 추출"""
     for key in ("itemNameBack", "item_name_back", "nameBack"):
-        if key in product and product[key]:
-            return str(product[key])
+        value = product.get(key)
+        if value:
+            return str(value)
     return ""
 
 
 def pick_product_image_url(product: Dict[str, Any]) -> str:
     """상품 이미지 URL 추출"""
     for key in ("productImageUrl", "product_image_url", "imageUrl", "image_url", "imgUrl"):
-        if key in product and product[key]:
-            return str(product[key])
+        value = product.get(key)
+        if value:
+            return str(value)
     return ""
 
 
 def pick_brand_name_en(product: Dict[str, Any]) -> str:
     """브랜드 영문명 추출"""
     for key in ("brandNameEn", "brandNameEng", "brandEn", "brandEnglish"):
-        if key in product and product[key]:
-            return str(product[key])
+        value = product.get(key)
+        if value:
+            return str(value)
     return ""
 
 
 def pick_customer_price(product: Dict[str, Any]) -> int:
     """정상가(고객가) 추출"""
     for key in ("customerPrice", "customer_price", "originalPrice", "basePrice"):
-        if key in product:
-            try:
-                return int(product[key])
-            except (TypeError, ValueError):
-                continue
+        value = product.get(key)
+        if value is None:
+            continue
+        try:
+            return int(value)
+        except (TypeError, ValueError):
+            continue
     return 0
 
 
 def pick_sale_price(product: Dict[str, Any]) -> int:
     """판매가 추출"""
     for key in ("salePrice", "sale_price"):
-        if key in product:
-            try:
-                return int(float(product[key]))
-            except (TypeError, ValueError):
-                continue
+        value = product.get(key)
+        if value is None:
+            continue
+        try:
+            return int(float(value))
+        except (TypeError, ValueError):
+            continue
     return 0
 
 
 def pick_final_price(product: Dict[str, Any]) -> int:
     """최종 판매가 추출"""
     for key in ("finalPrice", "final_price"):
-        if key in product:
-            try:
-                return int(product[key])
-            except (TypeError, ValueError):
-                continue
+        value = product.get(key)
+        if value is None:
+            continue
+        try:
+            return int(value)
+        except (TypeError, ValueError):
+            continue
     return 0
 
 
 def pick_category_depth3(product: Dict[str, Any]) -> str:
     """depth3 카테고리 추출"""
     for key in ("categoryDepthName3", "category_depth_name3", "depth3_name", "depth3Name"):
-        if key in product and product[key]:
-            return str(product[key])
+        value = product.get(key)
+        if value:
+            return str(value)
     return ""
 
 
 def pick_event_begin_datetime(product: Dict[str, Any]) -> str:
     """이벤트 시작 시간 추출"""
     for key in ("eventBeginDateTime", "event_begin_datetime", "eventStartDate"):
-        if key in product and product[key]:
-            return str(product[key])
+        value = product.get(key)
+        if value:
+            return str(value)
     return ""
 
 
 def pick_event_end_datetime(product: Dict[str, Any]) -> str:
     """이벤트 종료 시간 추출"""
     for key in ("eventEndDateTime", "event_end_datetime", "eventEndDate"):
-        if key in product and product[key]:
-            return str(product[key])
+        value = product.get(key)
+        if value:
+            return str(value)
     return ""
 
 
 def pick_status_code(product: Dict[str, Any]) -> str:
     """상품 상태 코드 추출"""
     for key in ("statusCd", "status_cd", "statusCode", "status"):
-        if key in product and product[key]:
-            return str(product[key])
+        value = product.get(key)
+        if value:
+            return str(value)
     return ""
 
 
 def pick_item_type_code(product: Dict[str, Any]) -> int:
     """상품 타입 코드 추출"""
     for key in ("itemTypeCd", "item_type_cd", "itemTypeCode", "typeCode"):
-        if key in product:
-            try:
-                return int(product[key])
-            except (TypeError, ValueError):
-                continue
+        value = product.get(key)
+        if value is None:
+            continue
+        try:
+            return int(value)
+        except (TypeError, ValueError):
+            continue
     return 0
 
 
 def pick_brand_code(product: Dict[str, Any]) -> int:
     """브랜드 코드 추출"""
     for key in ("brandCd", "brand_cd", "brandCode", "brand_code"):
-        if key in product:
-            try:
-                return int(product[key])
-            except (TypeError, ValueError):
-                continue
+        value = product.get(key)
+        if value is None:
+            continue
+        try:
+            return int(value)
+        except (TypeError, ValueError):
+            continue
     return 0
 
 
-def filter_products_by_brand(products: List[Dict[str, Any]], allowed_brands: List[str]) -> List[Dict[str, Any]]:
-    """브랜드로 필터링하고 원래 순위(인덱스) 저장"""
-    if not products:
-        return []
-    allowed_exact_korean = {b.strip() for b in allowed_brands if b.strip() and not b.strip().isascii()}
-    allowed_english_casefold = {b.strip().casefold() for b in allowed_brands if b.strip() and b.strip().isascii()}
+def filter_products_by_brand(
+    products: Iterable[Dict[str, Any]], allowed_brands: List[str]
+) -> List[Tuple[int, Dict[str, Any]]]:
+    """브랜드로 필터링해 (원래 순위, 상품) 튜플 반환 (리스트/제너레이터 모두 허용)
 
-    filtered: List[Dict[str, Any]] = []
+    순위는 배열 인덱스 + 1 — API 응답에 순위 필드가 없으므로 배열 순서가 곧 순위.
+    상품 dict는 변형하지 않고 순위를 함께 돌려준다.
+    """
+    if allowed_brands is ALLOWED_BRANDS:
+        allowed_exact_korean = _ALLOWED_EXACT_KOREAN
+        allowed_english_casefold = _ALLOWED_ENGLISH_CASEFOLD
+    else:
+        allowed_exact_korean = {b.strip() for b in allowed_brands if b.strip() and not b.strip().isascii()}
+        allowed_english_casefold = {b.strip().casefold() for b in allowed_brands if b.strip() and b.strip().isascii()}
+
+    filtered: List[Tuple[int, Dict[str, Any]]] = []
+    # 같은 응답 안에서는 브랜드 필드명이 고정이므로 첫 매칭 키를 기억해 재스캔 생략
+    brand_key: Optional[str] = None
     for idx, p in enumerate(products):
-        brand = pick_brand(p).strip()
+        value = p.get(brand_key) if brand_key is not None else None
+        if value:
+            brand = str(value).strip()
+        else:
+            brand, brand_key = _pick_brand_and_key(p)
+            brand = brand.strip()
         if not brand:
             continue
-        
-        # 원래 순위(배열 인덱스 + 1) 저장
-        # API 응답에 순위 필드가 없으므로 배열 순서가 곧 순위
-        if '_original_rank' not in p:
-            p['_original_rank'] = idx + 1
-        
+
         if brand in allowed_exact_korean:
-            filtered.append(p)
+            filtered.append((idx + 1, p))
             continue
-        if brand.casefold() in allowed_english_casefold:
-            filtered.append(p)
+        # 허용 영문 브랜드는 전부 ASCII이므로 한글 브랜드는 isascii()에서 바로 걸러짐
+        # (ASCII 문자열에서는 lower() == casefold(), 둘 다 C 레벨)
+        if brand.isascii() and brand.lower() in allowed_english_casefold:
+            filtered.append((idx + 1, p))
     return filtered
 
 
@@ -860,6 +1105,7 @@ def fetch_products_for_category_page(
     page_no: int,
     page_size: int,
     max_retries: int = 3,
+    session: Optional[requests.Session] = None,
 ) -> Tuple[List[Dict[str, Any]], Any]:
     payload = {
         "custNo": "0",
@@ -873,12 +1119,13 @@ def fetch_products_for_category_page(
         "pageNo": page_no,
     }
     
+    sess = session if session is not None else SESSION
     last_error = None
     for attempt in range(max_retries):
         try:
-            resp = requests.post(PRODUCT_ENDPOINT, headers=headers, json=payload, timeout=30)
+            resp = sess.post(PRODUCT_ENDPOINT, headers=headers, json=payload, timeout=30)
             resp.raise_for_status()
-            data = resp.json()
+            data = _json_loads(resp.content)
             products = extract_products_list(data)
             return products, data
         except requests.exceptions.HTTPError as e:
@@ -898,62 +1145,100 @@ def fetch_products_for_category_page(
     raise last_error if last_error else Exception("Unknown error")
 
 
+def _pagination_verdict(d: Dict[str, Any], current_page_no: int, page_size: int) -> Optional[bool]:
+    # Explicit boolean flags
+    for key in ("hasNext", "hasNextPage", "hasMore", "next"):
+        val = d.get(key)
+        if isinstance(val, bool):
+            return val
+
+    # Total pages
+    total_pages = d.get("totalPages") or d.get("lastPage") or d.get("pages")
+    if isinstance(total_pages, int) and total_pages > 0:
+        return current_page_no < total_pages
+
+    # Total count
+    total_count = d.get("totalCount") or d.get("totalElements") or d.get("count")
+    if isinstance(total_count, int) and total_count >= 0:
+        return (current_page_no * page_size) < total_count
+
+    return None
+
+
 def _infer_has_next_page(
     response_json: Any, current_page_no: int, page_size: int, last_page_count: int
 ) -> bool:
-    # Try to infer pagination from common fields present in the response body
-    def _dig(obj: Any) -> List[Dict[str, Any]]:
-        dicts: List[Dict[str, Any]] = []
-        if isinstance(obj, dict):
-            dicts.append(obj)
-            for v in obj.values():
-                dicts.extend(_dig(v))
-        elif isinstance(obj, list):
-            for item in obj:
-                dicts.extend(_dig(item))
-        return dicts
-
-    for d in _dig(response_json):
-        # Explicit boolean flags
-        for key in ("hasNext", "hasNextPage", "hasMore", "next"):
-            val = d.get(key)
-            if isinstance(val, bool):
-                return val
-
-        # Total pages
-        total_pages = d.get("totalPages") or d.get("lastPage") or d.get("pages")
-        if isinstance(total_pages, int) and total_pages > 0:
-            return current_page_no < total_pages
-
-        # Total count
-        total_count = d.get("totalCount") or d.get("totalElements") or d.get("count")
-        if isinstance(total_count, int) and total_count >= 0:
-            return (current_page_no * page_size) < total_count
+    # Pagination metadata lives at the top level or under 'data' — probe those
+    # first so the common case never walks the per-product dicts
+    if isinstance(response_json, dict):
+        probe_dicts = [response_json]
+        data = response_json.get("data")
+        if isinstance(data, dict):
+            probe_dicts.append(data)
+        for d in probe_dicts:
+            verdict = _pagination_verdict(d, current_page_no, page_size)
+            if verdict is not None:
+                return verdict
+
+    # Fallback: scan the whole response for the same fields
+    for d in iter_dicts(response_json):
+        verdict = _pagination_verdict(d, current_page_no, page_size)
+        if verdict is not None:
+            return verdict
 
     # Fallback: if we received a full page, assume there might be a next page
     return last_page_count >= page_size
 
 
-def fetch_all_products_for_category(
+def _page_contains_allowed_brand(products: List[Dict[str, Any]]) -> bool:
+    """페이지 안에 허용 브랜드 상품이 하나라도 있는지 검사 (조기 종료 판단용)"""
+    for p in products:
+        brand, _ = _pick_brand_and_key(p)
+        brand = brand.strip()
+        if not brand:
+            continue
+        if brand in _ALLOWED_EXACT_KOREAN:
+            return True
+        if brand.isascii() and brand.lower() in _ALLOWED_ENGLISH_CASEFOLD:
+            return True
+    return False
+
+
+def iter_products_for_category(
     headers: Dict[str, str],
     cat: CategoryPair,
     page_size: int = 200,
     max_pages: int = 0,
-) -> List[Dict[str, Any]]:
-    collected: List[Dict[str, Any]] = []
+    early_stop_after_empty_pages: int = 0,
+) -> Iterable[Dict[str, Any]]:
+    """카테고리의 상품을 페이지 단위로 받아 순서대로 yield (전체를 메모리에 모으지 않음)
+
+    early_stop_after_empty_pages가 양수면 허용 브랜드가 없는 페이지가 그만큼
+    연속되는 즉시 페이징을 중단 (0이면 전체 페이지 순회, 기존 동작 유지).
+    """
     current_page = 1
+    consecutive_empty_pages = 0
     while True:
         products, res_json = fetch_products_for_category_page(
             headers, cat, page_no=current_page, page_size=page_size
         )
         if not products:
             break
-        collected.extend(products)
+        yield from products
 
         # Stop if we've reached the configured page limit (0 means unlimited)
         if max_pages and current_page >= max_pages:
             break
 
+        # 베스트 순위는 단조이므로 허용 브랜드가 더는 안 나오면 뒤 페이지도 없을 가능성이 큼
+        if early_stop_after_empty_pages:
+            if _page_contains_allowed_brand(products):
+                consecutive_empty_pages = 0
+            else:
+                consecutive_empty_pages += 1
+                if consecutive_empty_pages >= early_stop_after_empty_pages:
+                    break
+
         has_next = _infer_has_next_page(
             response_json=res_json,
             current_page_no=current_page,
@@ -964,42 +1249,63 @@ def fetch_all_products_for_category(
             break
         current_page += 1
 
-    return collected
 
+CSV_HEADERS = [
+    "날짜", "시간", "상품코드", "브랜드코드", "브랜드명", "브랜드영문명",
+    "depth1_카테고리", "depth2_카테고리", "depth3_카테고리", "순위", "상품명",
+    "상품라벨앞", "상품라벨뒤", "서브상품명", "정상가", "판매가", "최종판매가",
+    "가격", "할인율", "상품URL", "상품이미지URL", "세일태그", "정보태그",
+    "당일배송", "리뷰수", "찜수", "리뷰평점", "상품상태코드", "상품타입코드",
+    "이벤트시작", "이벤트종료", "컨텐츠정보"
+]
 
-def write_csv(rows: List[List[Any]], output_dir: Path, timestamp: datetime) -> Tuple[Path, str]:
-    """CSV 파일 작성 및 타임스탬프 반환"""
-    # KST 기준 날짜별 폴더 생성: output/YYYY/MM/DD/
+
+def build_output_path(output_dir: Path, timestamp: datetime, extension: str) -> Tuple[Path, str]:
+    """KST 기준 날짜별 폴더(output/YYYY/MM/DD/)와 yyMMdd_hhmmss 파일명 생성"""
     year = timestamp.strftime('%Y')
     month = timestamp.strftime('%m')
     day = timestamp.strftime('%d')
     date_dir = output_dir / year / month / day
     date_dir.mkdir(parents=True, exist_ok=True)
-    
-    # 파일명: yyMMdd_hhmmss.csv
+
     time_suffix = timestamp.strftime('%y%m%d_%H%M%S')
-    filename = f"wconcept_best_{time_suffix}.csv"
-    out_path = date_dir / filename
-    
-    headers = [
-        "날짜", "시간", "상품코드", "브랜드코드", "브랜드명", "브랜드영문명", 
-        "depth1_카테고리", "depth2_카테고리", "depth3_카테고리", "순위", "상품명", 
-        "상품라벨앞", "상품라벨뒤", "서브상품명", "정상가", "판매가", "최종판매가", 
-        "가격", "할인율", "상품URL", "상품이미지URL", "세일태그", "정보태그",
-        "당일배송", "리뷰수", "찜수", "리뷰평점", "상품상태코드", "상품타입코드",
-        "이벤트시작", "이벤트종료", "컨텐츠정보"
-    ]
-    with out_path.open("w", newline="", encoding="utf-8-sig") as f:
-        writer = csv.writer(f)
-        writer.writerow(headers)
-        writer.writerows(rows)
-    
+    out_path = date_dir / f"wconcept_best_{time_suffix}.{extension}"
     return out_path, time_suffix
 
 
+def open_csv_writer(output_dir: Path, timestamp: datetime):
+    """CSV 파일을 열고 헤더를 기록한 writer 반환 (행은 수집 중 바로 스트리밍 기록)"""
+    out_path, time_suffix = build_output_path(output_dir, timestamp, "csv")
+
+    f = out_path.open("w", newline="", encoding="utf-8-sig", buffering=1 << 20)
+    writer = csv.writer(f)
+    writer.writerow(CSV_HEADERS)
+    return f, writer, out_path, time_suffix
+
+
+def write_parquet_rows(out_path: Path, rows: List[Tuple[Any, ...]]) -> None:
+    """수집된 행을 Parquet으로 기록 (열 단위 zstd 압축)
+
+    값은 CSV 출력과 동일하게 문자열화해 두 형식의 내용이 일치하도록 유지.
+    반복되는 날짜/카테고리/브랜드 열은 dictionary encoding으로 압축됨.
+    """
+    columns = {
+        header: [str(row[i]) for row in rows]
+        for i, header in enumerate(CSV_HEADERS)
+    }
+    table = pa.table(columns)
+    pq.write_table(table, out_path, compression="zstd")
+
+
 def main():
     parser = argparse.ArgumentParser(description="Export Wconcept best products filtered by keyword to CSV")
     parser.add_argument("--output-dir", default="output", help="CSV 출력 디렉터리")
+    parser.add_argument(
+        "--format",
+        choices=("csv", "parquet"),
+        default="csv",
+        help="출력 형식 (parquet은 pyarrow 필요, 기본 csv)",
+    )
     parser.add_argument("--page-size", type=int, default=200, help="페이지당 상품 수 (기본 200)")
     parser.add_argument(
         "--max-pages",
@@ -1007,6 +1313,24 @@ def main():
         default=0,
         help="최대 페이지 수 (0=제한 없음, 자동 종료)",
     )
+    parser.add_argument(
+        "--category-cache-ttl",
+        type=int,
+        default=CATEGORY_CACHE_TTL_SECONDS,
+        help=f"카테고리 캐시 유효 시간(초, 0=매번 갱신, 기본 {CATEGORY_CACHE_TTL_SECONDS})",
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=DEFAULT_FETCH_WORKERS,
+        help=f"카테고리 동시 수집 스레드 수 (기본 {DEFAULT_FETCH_WORKERS})",
+    )
+    parser.add_argument(
+        "--early-stop",
+        type=int,
+        default=0,
+        help="허용 브랜드 없는 페이지가 N회 연속되면 해당 카테고리 페이징 중단 (0=비활성, 기본)",
+    )
     parser.add_argument(
         "--skip-category-update",
         action="store_true",
@@ -1020,6 +1344,10 @@ def main():
     args = parser.parse_args()
 
     output_dir = Path(args.output_dir)
+    output_format = args.format
+    if output_format == "parquet" and not PYARROW_AVAILABLE:
+        print("⚠️ pyarrow 미설치 - CSV로 대체합니다 (pip install pyarrow)")
+        output_format = "csv"
 
     # 카테고리 로드
     if args.skip_category_update:
@@ -1037,38 +1365,38 @@ def main():
                 raise
         else:
             # 캐시 사용 - 헤더만 설정
-            base_headers = {
-                "accept": "*/*",
-                "accept-language": "ko-KR,ko;q=0.9,en-US;q=0.8,en;q=0.7",
-                "content-type": "application/json; charset=utf-8",
-                "display-api-key": "VWmkUPgs6g2fviPZ5JQFQ3pERP4tIXv/J2jppLqSRBk=",
-                "devicetype": "PC",
-                "membergrade": "8",
-                "birthdate": "",
-                "profileseqno": "",
-                "origin": "https://display.wconcept.co.kr",
-                "referer": "https://display.wconcept.co.kr/",
-                "sec-fetch-dest": "empty",
-                "sec-fetch-mode": "cors",
-                "sec-fetch-site": "same-site",
-                "user-agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/141.0.0.0 Safari/537.36",
-            }
+            base_headers = dict(_API_BASE_HEADERS)
     else:
-        # 정상 모드: Playwright로 카테고리 업데이트
-        try:
-            api_key, categories, base_headers = get_api_key_and_categories()
-        except Exception as e:
-            print(f"❌ 카테고리 수집 중 오류: {e}")
-            raise
+        # 정상 모드: TTL 이내로 갱신된 캐시는 부트스트랩 없이 재사용
+        cache_ttl = max(0, int(args.category_cache_ttl))
+        categories = load_cached_categories_if_fresh(cache_ttl)
+        if categories:
+            print(f"⚡ 카테고리 캐시 TTL({cache_ttl}초) 이내, 부트스트랩 생략")
+            base_headers = dict(_API_BASE_HEADERS)
+        else:
+            try:
+                api_key, categories, base_headers = get_api_key_and_categories()
+            except Exception as e:
+                print(f"❌ 카테고리 수집 중 오류: {e}")
+                raise
 
     kst_now = datetime.now(KST)
     date_str = kst_now.strftime("%Y-%m-%d")
     time_str = kst_now.strftime("%H:%M")
 
-    rows: List[List[Any]] = []
+    # CSV는 행을 메모리에 모으지 않고 바로 스트리밍, Parquet은 열 단위 기록을 위해 모아서 마지막에 기록
+    if output_format == "parquet":
+        csv_file = None
+        csv_writer = None
+        parquet_rows: List[Tuple[Any, ...]] = []
+        out_path, time_suffix = build_output_path(output_dir, kst_now, "parquet")
+    else:
+        csv_file, csv_writer, out_path, time_suffix = open_csv_writer(output_dir, kst_now)
+    total_rows = 0
 
     page_size = max(1, int(args.page_size))
     max_pages = max(0, int(args.max_pages))
+    early_stop = max(0, int(args.early_stop))
 
     # 테스트 모드인 경우 카테고리 제한
     test_categories = categories[:3] if args.test_mode else categories
@@ -1080,124 +1408,171 @@ def main():
     
     # 모든 카테고리에서 HACIE 제품 수집
     hacie_found_per_category = {}
-    
+
+    # 카테고리별 수집을 스레드 풀로 병렬 실행 (I/O 대기 동안 다른 카테고리 요청 진행)
+    # 브랜드 필터링과 행 구성도 워커에서 수행해 네트워크 대기와 CPU 작업을 겹침
+    def build_row(cat_d1: str, cat_d2: str, rank: int, p: Dict[str, Any]) -> Tuple[Any, ...]:
+        item_code = pick_item_code(p)
+        brand_code = pick_brand_code(p)
+        brand = pick_brand(p)
+        brand_name_en = pick_brand_name_en(p)
+        depth3 = pick_category_depth3(p)
+        name = pick_name(p)
+        item_name_front = pick_item_name_front(p)
+        item_name_back = pick_item_name_back(p)
+        item_name_sub = pick_item_name_sub(p)
+        customer_price = pick_customer_price(p)
+        sale_price = pick_sale_price(p)
+        final_price = pick_final_price(p)
+        price = pick_price(p)
+        discount_rate = pick_discount_rate(p)
+        url = pick_url(p)
+        product_image_url = pick_product_image_url(p)
+        sale_tag = pick_sale_tag(p)
+        info_tags = pick_info_tags(p)
+        is_today_delivery = pick_is_today_delivery(p)
+        review_count = pick_review_count(p)
+        heart_count = pick_heart_count(p)
+        review_score = pick_review_score(p)
+        status_code = pick_status_code(p)
+        item_type_code = pick_item_type_code(p)
+        event_begin = pick_event_begin_datetime(p)
+        event_end = pick_event_end_datetime(p)
+        content_info = pick_content_info(p)
+
+        return (
+            date_str,
+            time_str,
+            item_code,
+            brand_code if brand_code else "",
+            brand,
+            brand_name_en,
+            cat_d1,
+            cat_d2,
+            depth3,
+            rank,
+            name,
+            item_name_front,
+            item_name_back,
+            item_name_sub,
+            customer_price if customer_price else "",
+            sale_price if sale_price else "",
+            final_price if final_price else "",
+            price if price is not None else "",
+            discount_rate if discount_rate is not None else "",
+            url,
+            product_image_url,
+            sale_tag,
+            info_tags,
+            is_today_delivery,
+            review_count,
+            heart_count,
+            f"{review_score:.1f}" if review_score > 0 else "",
+            status_code,
+            item_type_code if item_type_code else "",
+            event_begin,
+            event_end,
+            content_info,
+        )
+
+    def process_category(
+        cat: CategoryPair,
+    ) -> Tuple[int, List[Dict[str, Any]], List[Tuple[int, Dict[str, Any]]], List[Tuple[Any, ...]]]:
+        # 스트리밍 필터: 페이지 단위로 받아 매칭 상품만 유지 (비매칭 대다수는 바로 버림)
+        total_count = 0
+        sample: List[Dict[str, Any]] = []
+
+        def counted_products() -> Iterable[Dict[str, Any]]:
+            nonlocal total_count
+            for p in iter_products_for_category(
+                base_headers,
+                cat,
+                page_size=page_size,
+                max_pages=max_pages,
+                early_stop_after_empty_pages=early_stop,
+            ):
+                total_count += 1
+                if args.test_mode and len(sample) < 3:
+                    sample.append(p)
+                yield p
+
+        filtered = filter_products_by_brand(counted_products(), ALLOWED_BRANDS)
+        # 카테고리 표시명은 행마다 동일하므로 한 번만 계산
+        cat_d1 = cat.depth1_name or cat.depth1_code
+        cat_d2 = cat.depth2_name or cat.depth2_code
+        rows = [build_row(cat_d1, cat_d2, rank, p) for rank, p in filtered]
+        return total_count, sample, filtered, rows
+
+    processed: Dict[CategoryPair, Tuple[int, List[Dict[str, Any]], List[Tuple[int, Dict[str, Any]]], List[Tuple[Any, ...]]]] = {}
+    fetch_errors: Dict[CategoryPair, Exception] = {}
+    max_workers = min(max(1, int(args.concurrency)), len(test_categories)) or 1
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        future_to_cat = {executor.submit(process_category, cat): cat for cat in test_categories}
+        for future in as_completed(future_to_cat):
+            cat = future_to_cat[future]
+            try:
+                processed[cat] = future.result()
+            except Exception as e:
+                fetch_errors[cat] = e
+
+    # 결과 기록은 원래 카테고리 순서대로 (출력/CSV 순서 유지)
     for cat in test_categories:
-        try:
-            print(f"  📂 {cat.depth1_name or cat.depth1_code} > {cat.depth2_name or cat.depth2_code}")
-            products = fetch_all_products_for_category(
-                base_headers, cat, page_size=page_size, max_pages=max_pages
-            )
-            print(f"     📦 총 {len(products)}개 상품 수집됨")
-            
-            # 디버깅: 첫 3개 상품의 브랜드 출력
-            if products and args.test_mode:
-                for idx, p in enumerate(products[:3]):
-                    brand = pick_brand(p)
-                    name = pick_name(p)
-                    print(f"       #{idx+1}: {brand} - {name[:30]}")
-                    
-        except Exception as e:
-            print(f"     ❌ 오류: {e}")
+        print(f"  📂 {cat.depth1_name or cat.depth1_code} > {cat.depth2_name or cat.depth2_code}")
+        error = fetch_errors.get(cat)
+        if error is not None:
+            print(f"     ❌ 오류: {error}")
             continue
-        
-        filtered = filter_products_by_brand(products, ALLOWED_BRANDS)
-        
+        total_count, sample, filtered, cat_rows = processed.get(cat, (0, [], [], []))
+        print(f"     📦 총 {total_count}개 상품 수집됨")
+
+        # 디버깅: 첫 3개 상품의 브랜드 출력
+        for idx, p in enumerate(sample):
+            brand = pick_brand(p)
+            name = pick_name(p)
+            print(f"       #{idx+1}: {brand} - {name[:30]}")
+
         # 카테고리별 HACIE 발견 카운트
         cat_key = f"{cat.depth1_name or cat.depth1_code} > {cat.depth2_name or cat.depth2_code}"
         hacie_found_per_category[cat_key] = len(filtered)
-        
+
         if filtered:
             print(f"     ✅ HACIE {len(filtered)}개 발견")
-            for idx, p in enumerate(filtered[:3]):
+            for rank, p in filtered[:3]:
                 name = pick_name(p)
-                rank = pick_rank(idx, p)
                 print(f"       - {rank}위: {name[:40]}")
-        
-        for idx, p in enumerate(filtered):
-            rank = pick_rank(idx, p)
-            item_code = pick_item_code(p)
-            brand_code = pick_brand_code(p)
-            brand = pick_brand(p)
-            brand_name_en = pick_brand_name_en(p)
-            depth3 = pick_category_depth3(p)
-            name = pick_name(p)
-            item_name_front = pick_item_name_front(p)
-            item_name_back = pick_item_name_back(p)
-            item_name_sub = pick_item_name_sub(p)
-            customer_price = pick_customer_price(p)
-            sale_price = pick_sale_price(p)
-            final_price = pick_final_price(p)
-            price = pick_price(p)
-            discount_rate = pick_discount_rate(p)
-            url = pick_url(p)
-            product_image_url = pick_product_image_url(p)
-            sale_tag = pick_sale_tag(p)
-            info_tags = pick_info_tags(p)
-            is_today_delivery = pick_is_today_delivery(p)
-            review_count = pick_review_count(p)
-            heart_count = pick_heart_count(p)
-            review_score = pick_review_score(p)
-            status_code = pick_status_code(p)
-            item_type_code = pick_item_type_code(p)
-            event_begin = pick_event_begin_datetime(p)
-            event_end = pick_event_end_datetime(p)
-            content_info = pick_content_info(p)
-            
-            rows.append(
-                [
-                    date_str,
-                    time_str,
-                    item_code,
-                    brand_code if brand_code else "",
-                    brand,
-                    brand_name_en,
-                    cat.depth1_name or cat.depth1_code,
-                    cat.depth2_name or cat.depth2_code,
-                    depth3,
-                    rank,
-                    name,
-                    item_name_front,
-                    item_name_back,
-                    item_name_sub,
-                    customer_price if customer_price else "",
-                    sale_price if sale_price else "",
-                    final_price if final_price else "",
-                    price if price is not None else "",
-                    discount_rate if discount_rate is not None else "",
-                    url,
-                    product_image_url,
-                    sale_tag,
-                    info_tags,
-                    is_today_delivery,
-                    review_count,
-                    heart_count,
-                    f"{review_score:.1f}" if review_score > 0 else "",
-                    status_code,
-                    item_type_code if item_type_code else "",
-                    event_begin,
-                    event_end,
-                    content_info,
-                ]
-            )
-    
+
+        if csv_writer is not None:
+            csv_writer.writerows(cat_rows)
+        else:
+            parquet_rows.extend(cat_rows)
+        total_rows += len(cat_rows)
+
     # 카테고리별 HACIE 발견 통계 출력
     print(f"\n📊 카테고리별 HACIE 제품 발견 현황:")
     for cat_key, count in sorted(hacie_found_per_category.items(), key=lambda x: -x[1]):
         if count > 0:
             print(f"  {cat_key}: {count}개")
 
-    if not rows:
-        # Write empty CSV with headers for traceability
-        out, time_suffix = write_csv([], output_dir, kst_now)
-        print(f"✅ CSV 생성 완료 (데이터 없음): {out}")
+    if csv_file is not None:
+        csv_file.close()
+    else:
+        # Parquet도 데이터가 없으면 헤더만 있는 빈 테이블을 기록 (CSV와 동일한 추적성)
+        write_parquet_rows(out_path, parquet_rows)
+
+    format_label = output_format.upper()
+    if total_rows == 0:
+        # Empty CSV with headers is still written for traceability
+        print(f"✅ {format_label} 생성 완료 (데이터 없음): {out_path}")
         print(f"⏰ 타임스탬프: {time_suffix}")
         return
 
-    out, time_suffix = write_csv(rows, output_dir, kst_now)
-    print(f"✅ CSV 생성 완료: {out}")
-    print(f"📊 총 {len(rows)}개 상품 수집됨")
+    print(f"✅ {format_label} 생성 완료: {out_path}")
+    print(f"📊 총 {total_rows}개 상품 수집됨")
     print(f"⏰ 타임스탬프: {time_suffix}")
 
 
 if __name__ == "__main__":
-    main()
+    try:
+        main()
+    finally:
+        SESSION.close()